@@ -0,0 +1,30 @@
+"""
+Django settings for running the rialtas_status test suite.
+
+Usage: python manage.py test --settings=rialtas_status.test_settings
+(pytest picks this module up from pytest.ini)
+"""
+from .settings import *  # noqa: F401,F403
+
+SECRET_KEY = 'test-secret-key'
+
+# In-memory SQLite keeps the test database off disk, so inserts skip fsync
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'TEST': {'NAME': ':memory:'},
+    }
+}
+
+# Tests create users; a fast hasher keeps create_user() from dominating setup
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Drop middleware the tests never exercise. The admin's system checks require
+# the session, auth and messages middleware, so those stay.
+MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+]
@@ -1,6 +1,16 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Service, StatusUpdate, APIKey
+from .models import STATUS_DISPLAY, Service, StatusUpdate, APIKey
+
+# Badge colors keyed by StatusUpdate.status, shared by the changelist badges
+_STATUS_COLORS = {
+    'stable': '#10b981',
+    'degraded': '#f59e0b',
+    'partial': '#f97316',
+    'down': '#ef4444',
+    'maintenance': '#3b82f6',
+}
+_BADGE_TMPL = '<span style="background-color: {}; color: white; padding: 3px 10px; border-radius: 4px; font-size: 12px;">{}</span>'
 
 
 @admin.register(Service)
@@ -10,22 +20,15 @@ class ServiceAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description']
     ordering = ['order', 'name']
     list_editable = ['order', 'is_active']
+    list_select_related = ('current_status',)
 
     def current_status_badge(self, obj):
-        status_update = obj.get_current_status()
+        status_update = obj.current_status
         if status_update:
-            color_map = {
-                'stable': '#10b981',
-                'degraded': '#f59e0b',
-                'partial': '#f97316',
-                'down': '#ef4444',
-                'maintenance': '#3b82f6',
-            }
-            color = color_map.get(status_update.status, '#6b7280')
             return format_html(
-                '<span style="background-color: {}; color: white; padding: 3px 10px; border-radius: 4px; font-size: 12px;">{}</span>',
-                color,
-                status_update.get_status_display()
+                _BADGE_TMPL,
+                _STATUS_COLORS.get(status_update.status, '#6b7280'),
+                STATUS_DISPLAY.get(status_update.status, status_update.status)
             )
         return format_html('<span style="color: #9ca3af;">No status</span>')
 
@@ -36,7 +39,8 @@ class ServiceAdmin(admin.ModelAdmin):
 class StatusUpdateAdmin(admin.ModelAdmin):
     list_display = ['service', 'status_badge', 'created_at', 'created_by_display', 'has_comments', 'has_plan']
     list_filter = ['status', 'service', 'created_at', 'created_by']
-    search_fields = ['service__name', 'comments', 'plan', 'created_by__username', 'created_by__first_name', 'created_by__last_name']
+    list_select_related = ('service', 'created_by')
+    search_fields = ['service__name', 'created_by__username']
     readonly_fields = ['created_at', 'created_by_display']
     ordering = ['-created_at']
     date_hierarchy = 'created_at'
@@ -52,19 +56,7 @@ class StatusUpdateAdmin(admin.ModelAdmin):
     )
 
     def status_badge(self, obj):
-        color_map = {
-            'stable': '#10b981',
-            'degraded': '#f59e0b',
-            'partial': '#f97316',
-            'down': '#ef4444',
-            'maintenance': '#3b82f6',
-        }
-        color = color_map.get(obj.status, '#6b7280')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 10px; border-radius: 4px; font-size: 12px;">{}</span>',
-            color,
-            obj.get_status_display()
-        )
+        return format_html(_BADGE_TMPL, _STATUS_COLORS.get(obj.status, '#6b7280'), STATUS_DISPLAY.get(obj.status, obj.status))
 
     status_badge.short_description = 'Status'
 
@@ -106,7 +98,7 @@ class StatusUpdateAdmin(admin.ModelAdmin):
 class APIKeyAdmin(admin.ModelAdmin):
     list_display = ['name', 'key_display', 'is_active', 'created_at', 'last_used_at', 'created_by']
     list_filter = ['is_active', 'created_at', 'last_used_at']
-    search_fields = ['name', 'key']
+    search_fields = ['name', 'key__exact']
     readonly_fields = ['key', 'created_at', 'last_used_at', 'created_by']
     ordering = ['-created_at']
     date_hierarchy = 'created_at'
@@ -1,11 +1,17 @@
 """
 Django Ninja API endpoints for status updates
 """
+import hashlib
 from typing import List
 
+import orjson
+from django.db.models import F, Value
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
 from ninja import NinjaAPI
-from ninja.errors import HttpError
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
 
 from .api_auth import APIKeyAuth
 from .api_schemas import (
@@ -15,18 +21,40 @@ from .api_schemas import (
     MessageSchema,
     ErrorSchema,
 )
-from .models import Service, StatusUpdate
+from .models import STATUS_DISPLAY, Service, StatusUpdate
+
+
+# Seconds clients may reuse a services list before revalidating its ETag
+SERVICES_MAX_AGE = 30
+
+# Columns read by service_to_dict(); the rest of each row, including the
+# creator's full user record, is left in the database
+SERVICE_WITH_STATUS_FIELDS = (
+    'id', 'name', 'description', 'order', 'is_active',
+    'current_status__status', 'current_status__comments', 'current_status__plan',
+    'current_status__created_at', 'current_status__created_by__username',
+)
+
+# The health check body never changes, so it is encoded once at import
+HEALTH_BODY = orjson.dumps({"message": "API is running"})
 
 
 # Helper functions to convert models to dictionaries
-def status_update_to_dict(update):
-    """Convert a StatusUpdate instance to a dictionary"""
+def status_update_to_dict(update, service=None):
+    """
+    Convert a StatusUpdate instance to a dictionary
+
+    Pass service when the caller already holds the update's service, to
+    avoid loading it again through update.service.
+    """
+    if service is None:
+        service = update.service
     return {
         'id': update.id,
-        'service_id': update.service.id,
-        'service_name': update.service.name,
+        'service_id': service.id,
+        'service_name': service.name,
         'status': update.status,
-        'status_display': update.get_status_display(),
+        'status_display': STATUS_DISPLAY.get(update.status, update.status),
         'comments': update.comments,
         'plan': update.plan,
         'created_at': update.created_at,
@@ -34,6 +62,25 @@ def status_update_to_dict(update):
     }
 
 
+def status_update_rows(updates, limit, service=None):
+    """
+    Serialize a StatusUpdate queryset straight from .values() rows
+
+    The rows come back already keyed like status_update_to_dict(), so no
+    model instances are built for list endpoints. Pass service when every
+    update belongs to it, to skip the join to the service table.
+    """
+    service_name = F('service__name') if service is None else Value(service.name)
+    rows = list(updates.values(
+        'id', 'service_id', 'status', 'comments', 'plan', 'created_at',
+        service_name=service_name,
+        created_by_username=F('created_by__username'),
+    )[:limit])
+    for row in rows:
+        row['status_display'] = STATUS_DISPLAY.get(row['status'], row['status'])
+    return rows
+
+
 def service_to_dict(service, include_status=True):
     """Convert a Service instance to a dictionary"""
     result = {
@@ -46,24 +93,39 @@ def service_to_dict(service, include_status=True):
 
     if include_status:
         current_status = service.get_current_status()
-        result['current_status'] = status_update_to_dict(current_status) if current_status else None
+        result['current_status'] = status_update_to_dict(current_status, service) if current_status else None
 
     return result
 
 
+class ORJSONRenderer(BaseRenderer):
+    """
+    Render API responses with orjson
+
+    Datetimes are handed to Ninja's own encoder, so timestamps keep the
+    millisecond "Z" format (2026-10-15T21:46:53.867Z) clients already parse.
+    """
+    media_type = "application/json"
+    encoder = NinjaJSONEncoder()
+
+    def render(self, request, data, *, response_status):
+        return orjson.dumps(data, default=self.encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
 # Create API instance with authentication
 api = NinjaAPI(
     title="Rialtas Status API",
     version="1.0.0",
     description="API for managing service status updates",
     auth=APIKeyAuth(),
+    renderer=ORJSONRenderer(),
 )
 
 
 # Status Update Endpoints
 @api.post(
     "/status-updates",
-    response={201: StatusUpdateSchema, 400: ErrorSchema},
+    response={201: StatusUpdateSchema, 404: ErrorSchema},
     summary="Create a new status update",
     description="Create a new status update for a service. Requires valid API key.",
 )
@@ -82,14 +144,6 @@ def create_status_update(request, payload: StatusUpdateCreateSchema):
     # Validate service exists
     service = get_object_or_404(Service, id=payload.service_id)
 
-    # Validate status choice
-    valid_statuses = [choice[0] for choice in StatusUpdate.STATUS_CHOICES]
-    if payload.status not in valid_statuses:
-        raise HttpError(
-            400,
-            f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
-        )
-
     # Create status update
     status_update = StatusUpdate.objects.create(
         service=service,
@@ -118,8 +172,7 @@ def list_status_updates(request, limit: int = 50):
     if limit > 200:
         limit = 200
 
-    updates = StatusUpdate.objects.select_related('service', 'created_by').all()[:limit]
-    return [status_update_to_dict(update) for update in updates]
+    return status_update_rows(StatusUpdate.objects.all(), limit)
 
 
 @api.get(
@@ -132,7 +185,10 @@ def get_status_update(request, update_id: int):
     """
     Get a specific status update by ID.
     """
-    update = get_object_or_404(StatusUpdate.objects.select_related('service', 'created_by'), id=update_id)
+    updates = StatusUpdate.objects.select_related('service', 'created_by').only(
+        'id', 'status', 'comments', 'plan', 'created_at', 'service__name', 'created_by__username'
+    )
+    update = get_object_or_404(updates, id=update_id)
     return status_update_to_dict(update)
 
 
@@ -143,18 +199,32 @@ def get_status_update(request, update_id: int):
     summary="List all services",
     description="Get a list of all services with their current status.",
 )
-def list_services(request, active_only: bool = True):
+def list_services(request, response: HttpResponse, active_only: bool = True):
     """
     List all services with their current status.
 
+    Responses carry an ETag; send it back in If-None-Match to get a
+    304 Not Modified, without the body, while the list is unchanged.
+
     **Query parameters:**
     - active_only: Only return active services (default: true)
     """
-    services = Service.objects.all()
+    services = Service.objects.select_related('current_status__created_by').only(*SERVICE_WITH_STATUS_FIELDS)
     if active_only:
         services = services.filter(is_active=True)
+    data = [service_to_dict(service) for service in services]
+
+    # Hashing the rendered list ties the ETag to the data itself, so it is the
+    # same on every worker and changes exactly when the list does
+    body = api.renderer.render(request, data, response_status=200)
+    response['ETag'] = quote_etag(hashlib.md5(body, usedforsecurity=False).hexdigest())
+    patch_cache_control(response, private=True, max_age=SERVICES_MAX_AGE)
 
-    return [service_to_dict(service) for service in services]
+    # A 304 carries over the ETag and Cache-Control set on response
+    conditional = get_conditional_response(request, etag=response['ETag'], response=response)
+    if conditional is not response:
+        return conditional
+    return data
 
 
 @api.get(
@@ -167,7 +237,10 @@ def get_service(request, service_id: int):
     """
     Get a specific service by ID with its current status.
     """
-    service = get_object_or_404(Service, id=service_id)
+    service = get_object_or_404(
+        Service.objects.select_related('current_status__created_by').only(*SERVICE_WITH_STATUS_FIELDS),
+        id=service_id,
+    )
     return service_to_dict(service)
 
 
@@ -184,13 +257,12 @@ def get_service_history(request, service_id: int, limit: int = 20):
     **Query parameters:**
     - limit: Maximum number of results (default: 20, max: 100)
     """
-    service = get_object_or_404(Service, id=service_id)
+    service = get_object_or_404(Service.objects.only('id', 'name'), id=service_id)
 
     if limit > 100:
         limit = 100
 
-    updates = service.status_updates.select_related('created_by').all()[:limit]
-    return [status_update_to_dict(update) for update in updates]
+    return status_update_rows(service.status_updates.all(), limit, service=service)
 
 
 # Health check endpoint (no authentication required)
@@ -205,4 +277,5 @@ def health_check(request):
     """
     Health check endpoint - no authentication required.
     """
-    return {"message": "API is running"}
+    # A fresh response each time, since middleware mutates response headers
+    return HttpResponse(HEALTH_BODY, content_type="application/json")
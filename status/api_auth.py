@@ -1,10 +1,39 @@
 """
 API authentication using API keys
 """
+import re
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
 from django.utils import timezone
 from ninja.security import HttpBearer
+from .caching import api_key_cache_key
 from .models import APIKey
 
+# Minimum number of seconds between last_used_at writes for the same key
+LAST_USED_UPDATE_INTERVAL = 60
+
+# Shape of every key APIKey.generate_key() issues: token_urlsafe(48)
+API_KEY_PATTERN = re.compile(r'[A-Za-z0-9_-]{64}')
+
+# Seconds a successful key lookup is cached. status.signals drops the entry
+# when a key changes, but with a per-process cache only in the worker that
+# saved it, so this also bounds how long other workers accept a revoked key.
+API_KEY_CACHE_TIMEOUT = 5
+
+
+def touch_last_used(api_key_id):
+    """Update last_used_at, at most once per interval per key"""
+    if not cache.add(f'apikey:last_used:{api_key_id}', 1, timeout=LAST_USED_UPDATE_INTERVAL):
+        return
+    now = timezone.now()
+    # The stored timestamp covers workers whose cache hasn't seen this key yet
+    recent = now - timedelta(seconds=LAST_USED_UPDATE_INTERVAL)
+    APIKey.objects.filter(pk=api_key_id).filter(
+        Q(last_used_at__isnull=True) | Q(last_used_at__lt=recent)
+    ).update(last_used_at=now)
+
 
 class APIKeyAuth(HttpBearer):
     """
@@ -15,13 +44,28 @@ class APIKeyAuth(HttpBearer):
     def authenticate(self, request, token):
         """
         Validate the API key and update last_used_at timestamp
-        Returns the APIKey object if valid, None otherwise
+        Returns the APIKey id if valid, None otherwise
         """
-        try:
-            api_key = APIKey.objects.get(key=token, is_active=True)
-            # Update last used timestamp
-            api_key.last_used_at = timezone.now()
-            api_key.save(update_fields=['last_used_at'])
-            return api_key
-        except APIKey.DoesNotExist:
+        # Malformed tokens can never match, so reject them without a query
+        if not API_KEY_PATTERN.fullmatch(token):
             return None
+
+        key_hash = APIKey.hash_key(token)
+        cache_key = api_key_cache_key(key_hash)
+        api_key_id = cache.get(cache_key)
+
+        if api_key_id is None:
+            # Only the id and last use are needed, so don't load the whole row
+            row = APIKey.objects.filter(
+                key_hash=key_hash, is_active=True
+            ).values_list('id', 'last_used_at').first()
+            if row is None:
+                return None
+            api_key_id, last_used_at = row
+            cache.set(cache_key, api_key_id, API_KEY_CACHE_TIMEOUT)
+
+            if last_used_at is not None and timezone.now() - last_used_at < timedelta(seconds=LAST_USED_UPDATE_INTERVAL):
+                return api_key_id
+
+        touch_last_used(api_key_id)
+        return api_key_id
@@ -2,15 +2,19 @@
 API schemas for request/response validation
 """
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from ninja import Schema
+from .models import STATUS_DISPLAY
+
+# Valid status codes, built from StatusUpdate.STATUS_CHOICES so the two can't drift
+StatusCode = Literal[tuple(STATUS_DISPLAY)]
 
 
 # Request Schemas
 class StatusUpdateCreateSchema(Schema):
     """Schema for creating a new status update"""
     service_id: int
-    status: str  # One of: stable, degraded, partial, down, maintenance
+    status: StatusCode
     comments: Optional[str] = ""
     plan: Optional[str] = ""
 
@@ -0,0 +1,32 @@
+"""
+Cache keys and versions shared by views, API authentication and signal handlers
+"""
+import uuid
+
+from django.core.cache import cache
+
+STATUS_VERSION_KEY = 'status:version'
+
+# With the default per-process LocMemCache a bump only reaches the worker that
+# made the write, so other workers keep their version until it expires. Keep
+# this no longer than the status page cache.
+STATUS_VERSION_TIMEOUT = 30
+
+
+def get_status_version():
+    """Return the current status version, starting a new one if none is cached"""
+    version = cache.get(STATUS_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(STATUS_VERSION_KEY, version, STATUS_VERSION_TIMEOUT)
+    return version
+
+
+def bump_status_version():
+    """Invalidate everything validated against the current status version"""
+    cache.set(STATUS_VERSION_KEY, uuid.uuid4().hex, STATUS_VERSION_TIMEOUT)
+
+
+def api_key_cache_key(key_hash):
+    """Cache key for the authentication lookup of an API key"""
+    return f'apikey:{key_hash}'
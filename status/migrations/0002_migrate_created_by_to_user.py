@@ -8,17 +8,13 @@ def migrate_created_by_to_user(apps, schema_editor):
     StatusUpdate = apps.get_model('status', 'StatusUpdate')
     User = apps.get_model('auth', 'User')
 
-    for update in StatusUpdate.objects.all():
-        if update.created_by:
-            # Try to find user by username
-            try:
-                user = User.objects.get(username=update.created_by)
-                # Store user ID temporarily in a separate field we'll create
-                update.temp_user_id = user.id
-                update.save(update_fields=['temp_user_id'])
-            except User.DoesNotExist:
-                # If user doesn't exist, leave it null
-                pass
+    usernames = StatusUpdate.objects.exclude(created_by='').values_list('created_by', flat=True).order_by().distinct()
+    # Map usernames to user IDs in one query; unknown usernames are left null
+    user_ids = dict(User.objects.filter(username__in=list(usernames)).values_list('username', 'id'))
+
+    for username, user_id in user_ids.items():
+        # Store user ID temporarily in a separate field we'll create
+        StatusUpdate.objects.filter(created_by=username).update(temp_user_id=user_id)
 
 
 def reverse_migration(apps, schema_editor):
@@ -26,14 +22,12 @@ def reverse_migration(apps, schema_editor):
     StatusUpdate = apps.get_model('status', 'StatusUpdate')
     User = apps.get_model('auth', 'User')
 
-    for update in StatusUpdate.objects.all():
-        if update.created_by_id:
-            try:
-                user = User.objects.get(id=update.created_by_id)
-                update.created_by = user.username
-                update.save(update_fields=['created_by'])
-            except User.DoesNotExist:
-                pass
+    # The user IDs have been copied back into temp_user_id by this point
+    user_ids = StatusUpdate.objects.filter(temp_user_id__isnull=False).values_list('temp_user_id', flat=True).order_by().distinct()
+    usernames = dict(User.objects.filter(id__in=list(user_ids)).values_list('id', 'username'))
+
+    for user_id, username in usernames.items():
+        StatusUpdate.objects.filter(temp_user_id=user_id).update(created_by=username)
 
 
 class Migration(migrations.Migration):
@@ -0,0 +1,32 @@
+# Trigram index so the admin's icontains search on service name can use an index
+
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    # pg_trgm is PostgreSQL-only; other backends keep the plain scan
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Django compiles icontains to UPPER(col::text) LIKE UPPER(%s), so index that expression
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS status_service_name_trgm "
+        "ON status_service USING gin (UPPER(name::text) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS status_service_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('status', '0004_alter_statusupdate_comments_apikey'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated migration to index status updates by service and status, newest first
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('status', '0005_service_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='statusupdate',
+            index=models.Index(fields=['service', 'status', '-created_at'], name='status_su_svc_status_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated migration to denormalize each service's newest status update
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_current_status(apps, schema_editor):
+    """Point every service at its newest status update"""
+    Service = apps.get_model('status', 'Service')
+    StatusUpdate = apps.get_model('status', 'StatusUpdate')
+
+    latest = StatusUpdate.objects.filter(service=OuterRef('pk')).order_by('-created_at').values('pk')[:1]
+    Service.objects.update(current_status=Subquery(latest))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('status', '0006_statusupdate_service_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='current_status',
+            field=models.OneToOneField(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='status.statusupdate'),
+        ),
+        migrations.RunPython(backfill_current_status, migrations.RunPython.noop),
+    ]
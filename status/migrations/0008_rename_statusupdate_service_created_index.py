@@ -0,0 +1,18 @@
+# Generated migration to give the (service, -created_at) index an explicit name
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('status', '0007_service_current_status'),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name='statusupdate',
+            new_name='statusup_svc_created_idx',
+            old_name='status_stat_service_0cc391_idx',
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated migration to look up API keys by a SHA-256 hash of the key
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def populate_key_hash(apps, schema_editor):
+    """Hash every existing API key"""
+    APIKey = apps.get_model('status', 'APIKey')
+
+    api_keys = list(APIKey.objects.only('id', 'key'))
+    for api_key in api_keys:
+        api_key.key_hash = hashlib.sha256(api_key.key.encode()).hexdigest()
+    APIKey.objects.bulk_update(api_keys, ['key_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('status', '0008_rename_statusupdate_service_created_index'),
+    ]
+
+    operations = [
+        # Add nullable first so existing rows can be populated
+        migrations.AddField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(populate_key_hash, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.CharField(editable=False, max_length=64, unique=True),
+        ),
+    ]
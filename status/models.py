@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils import timezone
 from django.conf import settings
+import hashlib
 import secrets
 
 
@@ -12,6 +13,10 @@ class Service(models.Model):
     order = models.IntegerField(default=0, help_text="Display order (lower numbers first)")
     is_active = models.BooleanField(default=True, help_text="Show on status page")
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized pointer to the newest update, kept in sync by status.signals
+    current_status = models.OneToOneField(
+        'StatusUpdate', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+'
+    )
 
     class Meta:
         ordering = ['order', 'name']
@@ -19,9 +24,18 @@ class Service(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Never write back a possibly stale current_status; status.signals owns
+        # it, so a full save takes whatever is stored (nothing for a new row)
+        if kwargs.get('update_fields') is None:
+            self.current_status_id = None if self.pk is None else (
+                Service.objects.filter(pk=self.pk).values_list('current_status', flat=True).first()
+            )
+        super().save(*args, **kwargs)
+
     def get_current_status(self):
         """Get the most recent status update for this service"""
-        return self.status_updates.order_by('-created_at').first()
+        return self.current_status
 
     def get_recent_updates(self, limit=5):
         """Get the most recent status updates"""
@@ -50,7 +64,9 @@ class StatusUpdate(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['service', '-created_at']),
+            # Serves latest-update-per-service lookups and per-service history
+            models.Index(fields=['service', '-created_at'], name='statusup_svc_created_idx'),
+            models.Index(fields=['service', 'status', '-created_at'], name='status_su_svc_status_idx'),
         ]
 
     def __str__(self):
@@ -68,11 +84,25 @@ class StatusUpdate(models.Model):
         return colors.get(self.status, 'gray')
 
 
+# Status code -> display label, for hot paths that skip get_status_display()
+STATUS_DISPLAY = dict(StatusUpdate.STATUS_CHOICES)
+
+# Severity of each status; the worst one across services is the overall status
+STATUS_RANK = {
+    'stable': 0,
+    'maintenance': 1,
+    'degraded': 2,
+    'partial': 3,
+    'down': 4,
+}
+
+
 class APIKey(models.Model):
     """API key for authenticating external applications"""
 
     name = models.CharField(max_length=100, help_text="Descriptive name for this API key (e.g., 'Mobile App', 'Monitoring Service')")
     key = models.CharField(max_length=64, unique=True, editable=False)
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
     is_active = models.BooleanField(default=True, help_text="Whether this API key is currently active")
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
@@ -89,9 +119,15 @@ class APIKey(models.Model):
     def save(self, *args, **kwargs):
         if not self.key:
             self.key = self.generate_key()
+        self.key_hash = self.hash_key(self.key)
         super().save(*args, **kwargs)
 
     @staticmethod
     def generate_key():
         """Generate a secure random API key"""
-        return secrets.token_urlsafe(48)
\ No newline at end of file
+        return secrets.token_urlsafe(48)
+
+    @staticmethod
+    def hash_key(key):
+        """Return the SHA-256 hex digest that API keys are looked up by"""
+        return hashlib.sha256(key.encode()).hexdigest()
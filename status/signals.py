@@ -0,0 +1,50 @@
+"""
+Signal handlers keeping denormalized and cached status data in sync
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import api_key_cache_key, bump_status_version
+from .models import APIKey, Service, StatusUpdate
+
+
+@receiver(post_save, sender=StatusUpdate)
+@receiver(post_delete, sender=StatusUpdate)
+def refresh_current_status(sender, instance, **kwargs):
+    """
+    Point Service.current_status at each affected service's newest update
+
+    Recomputing (rather than assigning instance) keeps the pointer right when
+    an update is back-dated, moved to another service, or deleted.
+    """
+    latest = StatusUpdate.objects.filter(service=OuterRef('pk')).order_by('-created_at').values('pk')[:1]
+    # Release instance from any service it was moved away from first, so the
+    # unique current_status column never holds it twice mid-statement
+    Service.objects.filter(current_status=instance.pk).exclude(pk=instance.service_id).update(
+        current_status=Subquery(latest)
+    )
+    Service.objects.filter(pk=instance.service_id).update(current_status=Subquery(latest))
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=StatusUpdate)
+@receiver(post_delete, sender=StatusUpdate)
+def status_changed(sender, **kwargs):
+    """
+    Bump the status version once a service or status update change commits
+
+    Bumping earlier would let a concurrent request cache a page built from
+    the old rows under the new version.
+    """
+    transaction.on_commit(bump_status_version)
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def api_key_changed(sender, instance, **kwargs):
+    """Drop the cached authentication lookup so deactivated keys stop working"""
+    cache.delete(api_key_cache_key(instance.key_hash))
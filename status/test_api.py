@@ -1,7 +1,10 @@
 """
 Comprehensive tests for the Rialtas Status API
 """
-from django.test import TestCase
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from status.models import Service, StatusUpdate, APIKey
@@ -12,8 +15,9 @@ User = get_user_model()
 class APIKeyModelTests(TestCase):
     """Test the APIKey model"""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpass123'
         )
@@ -26,41 +30,46 @@ class APIKeyModelTests(TestCase):
         )
         self.assertIsNotNone(api_key.key)
         self.assertEqual(len(api_key.key), 64)
+        self.assertEqual(api_key.key_hash, APIKey.hash_key(api_key.key))
         self.assertTrue(api_key.is_active)
         self.assertEqual(api_key.name, "Test App")
 
+    def test_api_key_unique(self):
+        """Test that API keys are unique"""
+        key1 = APIKey.objects.create(name="App 1")
+        key2 = APIKey.objects.create(name="App 2")
+        self.assertNotEqual(key1.key, key2.key)
+
+
+class APIKeyStringTests(SimpleTestCase):
+    """Test APIKey behaviour that doesn't need the database"""
+
     def test_api_key_string_representation(self):
         """Test the API key string representation"""
-        api_key = APIKey.objects.create(
-            name="Test App",
-            is_active=True
-        )
+        api_key = APIKey(name="Test App", is_active=True)
         self.assertEqual(str(api_key), "Test App (Active)")
 
         api_key.is_active = False
-        api_key.save()
         self.assertEqual(str(api_key), "Test App (Inactive)")
 
-    def test_api_key_unique(self):
-        """Test that API keys are unique"""
-        key1 = APIKey.objects.create(name="App 1")
-        key2 = APIKey.objects.create(name="App 2")
-        self.assertNotEqual(key1.key, key2.key)
-
 
 class APIAuthenticationTests(TestCase):
     """Test API authentication"""
 
-    def setUp(self):
-        self.api_key = APIKey.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = APIKey.objects.create(
             name="Test App",
             is_active=True
         )
-        self.service = Service.objects.create(
+        cls.service = Service.objects.create(
             name="Test Service",
             description="A test service"
         )
 
+    def setUp(self):
+        cache.clear()
+
     def test_health_check_no_auth_required(self):
         """Test that health check endpoint doesn't require authentication"""
         response = self.client.get('/api/health')
@@ -81,6 +90,12 @@ class APIAuthenticationTests(TestCase):
     def test_api_with_invalid_key(self):
         """Test API access with invalid API key"""
         headers = {'HTTP_AUTHORIZATION': 'Bearer invalid_key_12345'}
+        # Malformed keys are rejected before the database is queried
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/services', **headers)
+        self.assertEqual(response.status_code, 401)
+
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {APIKey.generate_key()}'}
         response = self.client.get('/api/services', **headers)
         self.assertEqual(response.status_code, 401)
 
@@ -93,6 +108,18 @@ class APIAuthenticationTests(TestCase):
         response = self.client.get('/api/services', **headers)
         self.assertEqual(response.status_code, 401)
 
+    def test_api_key_deactivated_after_use(self):
+        """Test that deactivating a key rejects it even after a cached lookup"""
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {self.api_key.key}'}
+        response = self.client.get('/api/services', **headers)
+        self.assertEqual(response.status_code, 200)
+
+        self.api_key.is_active = False
+        self.api_key.save()
+
+        response = self.client.get('/api/services', **headers)
+        self.assertEqual(response.status_code, 401)
+
     def test_api_key_last_used_updated(self):
         """Test that last_used_at is updated when API key is used"""
         self.assertIsNone(self.api_key.last_used_at)
@@ -103,14 +130,26 @@ class APIAuthenticationTests(TestCase):
         self.api_key.refresh_from_db()
         self.assertIsNotNone(self.api_key.last_used_at)
 
+    def test_api_key_last_used_throttled(self):
+        """Test that last_used_at is written at most once per interval"""
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {self.api_key.key}'}
+        self.client.get('/api/services', **headers)
+        self.api_key.refresh_from_db()
+        first_used_at = self.api_key.last_used_at
+
+        self.client.get('/api/services', **headers)
+        self.api_key.refresh_from_db()
+        self.assertEqual(self.api_key.last_used_at, first_used_at)
+
 
 class StatusUpdateAPITests(TestCase):
     """Test status update API endpoints"""
 
-    def setUp(self):
-        self.api_key = APIKey.objects.create(name="Test App")
-        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {self.api_key.key}'}
-        self.service = Service.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = APIKey.objects.create(name="Test App")
+        cls.headers = {'HTTP_AUTHORIZATION': f'Bearer {cls.api_key.key}'}
+        cls.service = Service.objects.create(
             name="Test Service",
             description="A test service"
         )
@@ -180,7 +219,7 @@ class StatusUpdateAPITests(TestCase):
             **self.headers
         )
 
-        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.status_code, 422)
 
     def test_create_status_update_invalid_service(self):
         """Test creating a status update for non-existent service"""
@@ -213,7 +252,10 @@ class StatusUpdateAPITests(TestCase):
             comments='Second update'
         )
 
-        response = self.client.get('/api/status-updates', **self.headers)
+        # Warm the API key cache so only the endpoint's own queries are counted
+        self.client.get('/api/status-updates', **self.headers)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/status-updates', **self.headers)
 
         self.assertEqual(response.status_code, 200)
         json_data = response.json()
@@ -224,13 +266,17 @@ class StatusUpdateAPITests(TestCase):
 
     def test_list_status_updates_with_limit(self):
         """Test listing status updates with limit parameter"""
-        # Create 10 status updates
-        for i in range(10):
-            StatusUpdate.objects.create(
+        # Create 10 status updates in one INSERT, with distinct timestamps
+        now = timezone.now()
+        StatusUpdate.objects.bulk_create([
+            StatusUpdate(
                 service=self.service,
                 status='stable',
-                comments=f'Update {i}'
+                comments=f'Update {i}',
+                created_at=now + timedelta(seconds=i)
             )
+            for i in range(10)
+        ])
 
         response = self.client.get('/api/status-updates?limit=5', **self.headers)
 
@@ -253,6 +299,18 @@ class StatusUpdateAPITests(TestCase):
         self.assertEqual(json_data['id'], update.id)
         self.assertEqual(json_data['comments'], 'Test update')
 
+    def test_status_update_timestamp_format(self):
+        """Test that timestamps are rendered in UTC with millisecond precision"""
+        update = StatusUpdate.objects.create(
+            service=self.service,
+            status='stable',
+            created_at=datetime.fromisoformat('2026-10-15T21:46:53.867530+00:00')
+        )
+
+        response = self.client.get(f'/api/status-updates/{update.id}', **self.headers)
+
+        self.assertEqual(response.json()['created_at'], '2026-10-15T21:46:53.867Z')
+
     def test_get_nonexistent_status_update(self):
         """Test getting a non-existent status update"""
         response = self.client.get('/api/status-updates/99999', **self.headers)
@@ -262,16 +320,17 @@ class StatusUpdateAPITests(TestCase):
 class ServiceAPITests(TestCase):
     """Test service API endpoints"""
 
-    def setUp(self):
-        self.api_key = APIKey.objects.create(name="Test App")
-        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {self.api_key.key}'}
-        self.service1 = Service.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = APIKey.objects.create(name="Test App")
+        cls.headers = {'HTTP_AUTHORIZATION': f'Bearer {cls.api_key.key}'}
+        cls.service1 = Service.objects.create(
             name="Service 1",
             description="First service",
             order=1,
             is_active=True
         )
-        self.service2 = Service.objects.create(
+        cls.service2 = Service.objects.create(
             name="Service 2",
             description="Second service",
             order=2,
@@ -280,7 +339,10 @@ class ServiceAPITests(TestCase):
 
     def test_list_services_active_only(self):
         """Test listing only active services"""
-        response = self.client.get('/api/services', **self.headers)
+        # Warm the API key cache so only the endpoint's own queries are counted
+        self.client.get('/api/services', **self.headers)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/services', **self.headers)
 
         self.assertEqual(response.status_code, 200)
         json_data = response.json()
@@ -295,6 +357,58 @@ class ServiceAPITests(TestCase):
         json_data = response.json()
         self.assertEqual(len(json_data), 2)
 
+    def test_list_services_query_count(self):
+        """Test that listing services takes one query however many have updates"""
+        for service in (self.service1, self.service2):
+            StatusUpdate.objects.create(service=service, status='stable')
+            StatusUpdate.objects.create(service=service, status='degraded')
+
+        # Warm the API key cache so only the endpoint's own queries are counted
+        self.client.get('/api/services?active_only=false', **self.headers)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/services?active_only=false', **self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s['current_status']['status'] for s in response.json()], ['degraded', 'degraded'])
+
+    def test_list_services_not_modified(self):
+        """Test that a matching If-None-Match returns 304 Not Modified"""
+        response = self.client.get('/api/services', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get('/api/services', HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('max-age=30', response['Cache-Control'])
+
+    def test_list_services_etag_changes_on_service_edit(self):
+        """Test that editing a listed service invalidates the services ETag"""
+        response = self.client.get('/api/services', **self.headers)
+        etag = response['ETag']
+
+        self.service1.description = 'Renamed'
+        self.service1.save()
+
+        response = self.client.get('/api/services', HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_services_etag_changes_on_status_update(self):
+        """Test that a new status update invalidates the services ETag"""
+        response = self.client.get('/api/services', **self.headers)
+        etag = response['ETag']
+
+        StatusUpdate.objects.create(
+            service=self.service1,
+            status='down',
+            comments='Outage'
+        )
+
+        response = self.client.get('/api/services', HTTP_IF_NONE_MATCH=etag, **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
     def test_get_service_with_current_status(self):
         """Test getting a service with its current status"""
         # Create a status update
@@ -304,7 +418,10 @@ class ServiceAPITests(TestCase):
             comments='Performance issues'
         )
 
-        response = self.client.get(f'/api/services/{self.service1.id}', **self.headers)
+        # Warm the API key cache so only the endpoint's own queries are counted
+        self.client.get(f'/api/services/{self.service1.id}', **self.headers)
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/services/{self.service1.id}', **self.headers)
 
         self.assertEqual(response.status_code, 200)
         json_data = response.json()
@@ -313,6 +430,55 @@ class ServiceAPITests(TestCase):
         self.assertIsNotNone(json_data['current_status'])
         self.assertEqual(json_data['current_status']['status'], 'degraded')
 
+    def test_get_service_current_status_after_delete(self):
+        """Test that deleting the current update falls back to the previous one"""
+        previous = StatusUpdate.objects.create(
+            service=self.service1,
+            status='degraded',
+            comments='Performance issues'
+        )
+        current = StatusUpdate.objects.create(
+            service=self.service1,
+            status='down',
+            comments='Outage'
+        )
+        current.delete()
+
+        response = self.client.get(f'/api/services/{self.service1.id}', **self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['current_status']['id'], previous.id)
+
+    def test_get_service_current_status_after_move(self):
+        """Test that moving an update to another service moves the current status"""
+        update = StatusUpdate.objects.create(
+            service=self.service2,
+            status='down',
+            comments='Filed against the wrong service'
+        )
+        update.service = self.service1
+        update.save()
+
+        response = self.client.get(f'/api/services/{self.service1.id}', **self.headers)
+        self.assertEqual(response.json()['current_status']['id'], update.id)
+
+        response = self.client.get(f'/api/services/{self.service2.id}', **self.headers)
+        self.assertIsNone(response.json()['current_status'])
+
+    def test_get_service_current_status_after_stale_save(self):
+        """Test that saving a service loaded before an update keeps the new current status"""
+        stale = Service.objects.get(pk=self.service1.pk)
+        update = StatusUpdate.objects.create(
+            service=self.service1,
+            status='down',
+            comments='Outage'
+        )
+        stale.description = 'Edited while the outage was posted'
+        stale.save()
+
+        response = self.client.get(f'/api/services/{self.service1.id}', **self.headers)
+        self.assertEqual(response.json()['current_status']['id'], update.id)
+
     def test_get_service_without_status(self):
         """Test getting a service that has no status updates"""
         response = self.client.get(f'/api/services/{self.service1.id}', **self.headers)
@@ -344,13 +510,17 @@ class ServiceAPITests(TestCase):
 
     def test_get_service_history_with_limit(self):
         """Test getting service status history with limit"""
-        # Create 10 status updates
-        for i in range(10):
-            StatusUpdate.objects.create(
+        # Create 10 status updates in one INSERT, with distinct timestamps
+        now = timezone.now()
+        StatusUpdate.objects.bulk_create([
+            StatusUpdate(
                 service=self.service1,
                 status='stable',
-                comments=f'Update {i}'
+                comments=f'Update {i}',
+                created_at=now + timedelta(seconds=i)
             )
+            for i in range(10)
+        ])
 
         response = self.client.get(
             f'/api/services/{self.service1.id}/history?limit=3',
@@ -370,10 +540,11 @@ class ServiceAPITests(TestCase):
 class APIIntegrationTests(TestCase):
     """Integration tests for complete API workflows"""
 
-    def setUp(self):
-        self.api_key = APIKey.objects.create(name="Integration Test App")
-        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {self.api_key.key}'}
-        self.service = Service.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.api_key = APIKey.objects.create(name="Integration Test App")
+        cls.headers = {'HTTP_AUTHORIZATION': f'Bearer {cls.api_key.key}'}
+        cls.service = Service.objects.create(
             name="Production API",
             description="Main production API"
         )
@@ -1,3 +1,124 @@
+"""
+Tests for the public status page views
+"""
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from status.models import Service, StatusUpdate
+
+
+class StatusPageTests(TestCase):
+    """Test the public status page"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.service = Service.objects.create(
+            name="Database",
+            description="Primary database"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_status_page_shows_worst_status(self):
+        """Test that the overall banner reflects the worst current status"""
+        other = Service.objects.create(name="Cloudflare")
+        StatusUpdate.objects.create(service=self.service, status='degraded')
+        StatusUpdate.objects.create(service=other, status='partial')
+
+        response = self.client.get('/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['overall_status'], 'partial')
+
+    def test_status_page_query_count(self):
+        """Test that the page takes a fixed number of queries and is then cached"""
+        other = Service.objects.create(name="Cloudflare")
+        # Updates made in the admin always have a creator, whose full name is shown
+        user = get_user_model().objects.create_user(
+            username='oncall', first_name='Aoife', last_name='Byrne'
+        )
+        for service in (self.service, other):
+            StatusUpdate.objects.create(service=service, status='stable', created_by=user)
+            StatusUpdate.objects.create(service=service, status='degraded', created_by=user)
+
+        # Services and their prefetched recent updates
+        with self.assertNumQueries(2):
+            response = self.client.get('/')
+        self.assertContains(response, 'by Aoife Byrne')
+        with self.assertNumQueries(0):
+            self.client.get('/')
+
+    def test_status_page_not_modified(self):
+        """Test that a matching If-None-Match returns 304 Not Modified"""
+        response = self.client.get('/')
+        etag = response['ETag']
+
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_status_page_refreshes_after_status_update(self):
+        """Test that a new status update replaces the cached page"""
+        response = self.client.get('/')
+        self.assertContains(response, 'All Systems Operational')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            StatusUpdate.objects.create(service=self.service, status='down', comments='Disk full')
+
+        response = self.client.get('/')
+        self.assertContains(response, 'Disk full')
+        self.assertNotContains(response, 'All Systems Operational')
+
+
+class ServiceHistoryJSONTests(TestCase):
+    """Test the service history JSON view"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.service = Service.objects.create(name="Database")
+        cls.user = get_user_model().objects.create_user(username='oncall')
+        StatusUpdate.objects.create(service=cls.service, status='degraded', comments='Slow queries')
+        StatusUpdate.objects.create(
+            service=cls.service, status='down', comments='Disk full', plan='Adding storage', created_by=cls.user
+        )
+
+    def test_service_history_json(self):
+        """Test the history payload, newest update first"""
+        # The service, then its updates with their creators
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/service/{self.service.id}/history/')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['service'], 'Database')
+        newest, oldest = data['updates']
+        self.assertEqual(
+            set(newest), {'status', 'status_code', 'problem', 'plan', 'created_at', 'created_by'}
+        )
+        self.assertEqual(newest['status'], 'Major Outage')
+        self.assertEqual(newest['status_code'], 'down')
+        self.assertEqual(newest['problem'], 'Disk full')
+        self.assertEqual(newest['plan'], 'Adding storage')
+        self.assertEqual(newest['created_by'], 'oncall')
+        self.assertIsNone(oldest['created_by'])
+
+    def test_service_history_json_timestamp_format(self):
+        """Test that timestamps keep the ISO 8601 format of datetime.isoformat()"""
+        service = Service.objects.create(name="Cloudflare")
+        StatusUpdate.objects.create(
+            service=service, status='stable', created_at=datetime.fromisoformat('2026-10-15T21:46:53.867530+00:00')
+        )
+
+        response = self.client.get(f'/api/service/{service.id}/history/')
+
+        self.assertEqual(response.json()['updates'][0]['created_at'], '2026-10-15T21:46:53.867530+00:00')
+
+    def test_service_history_json_inactive_service(self):
+        """Test that inactive services are not exposed"""
+        self.service.is_active = False
+        self.service.save()
 
-# Create your tests here.
+        response = self.client.get(f'/api/service/{self.service.id}/history/')
+        self.assertEqual(response.status_code, 404)
@@ -1,18 +1,37 @@
+import orjson
+from django.core.cache import cache
+from django.db.models import Prefetch
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
-from .models import Service, StatusUpdate
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, set_response_etag
+from .caching import get_status_version
+from .models import STATUS_RANK, Service, StatusUpdate
 
 
-def status_page(request):
-    """Main status page showing all services and their current status"""
-    services = Service.objects.filter(is_active=True).prefetch_related('status_updates__created_by')
+# Number of recent updates shown per service on the status page
+RECENT_UPDATES_LIMIT = 5
+
+# Seconds a rendered status page may be served from cache
+STATUS_PAGE_TIMEOUT = 30
+
+
+def _status_page_context():
+    """Build the status page context from the database"""
+    # A sliced prefetch fetches only each service's newest updates, in one query
+    recent = StatusUpdate.objects.select_related('created_by').only(
+        'service', 'status', 'comments', 'plan', 'created_at',
+        'created_by__username', 'created_by__first_name', 'created_by__last_name',
+    ).order_by('-created_at')[:RECENT_UPDATES_LIMIT]
+    services = Service.objects.filter(is_active=True).only('name', 'description').prefetch_related(
+        Prefetch('status_updates', queryset=recent, to_attr='prefetched_updates')
+    )
 
     services_data = []
-    overall_status = 'stable'
 
     for service in services:
-        current_status = service.get_current_status()
-        recent_updates = service.get_recent_updates(limit=5)
+        recent_updates = service.prefetched_updates
+        current_status = recent_updates[0] if recent_updates else None
 
         services_data.append({
             'service': service,
@@ -20,23 +39,30 @@ def status_page(request):
             'recent_updates': recent_updates,
         })
 
-        # Determine overall status (worst case wins)
-        if current_status:
-            if current_status.status == 'down':
-                overall_status = 'down'
-            elif current_status.status == 'partial' and overall_status != 'down':
-                overall_status = 'partial'
-            elif current_status.status == 'degraded' and overall_status not in ['down', 'partial']:
-                overall_status = 'degraded'
-            elif current_status.status == 'maintenance' and overall_status == 'stable':
-                overall_status = 'maintenance'
+    # Determine overall status (worst case wins) from the updates already loaded
+    current_statuses = [item['current_status'].status for item in services_data if item['current_status']]
+    overall_status = max(current_statuses, key=lambda status: STATUS_RANK.get(status, 0), default='stable')
 
-    context = {
+    return {
         'services_data': services_data,
         'overall_status': overall_status,
     }
 
-    return render(request, 'status/status_page.html', context)
+
+def status_page(request):
+    """Main status page showing all services and their current status"""
+    # The page is the same for every visitor, so it is rendered without the
+    # request and cached until the status version changes
+    cache_key = f'status_page:{get_status_version()}'
+    content = cache.get(cache_key)
+    if content is None:
+        content = render_to_string('status/status_page.html', _status_page_context())
+        cache.set(cache_key, content, STATUS_PAGE_TIMEOUT)
+    response = HttpResponse(content)
+    # Hashing the page itself means the ETag only stays the same while the
+    # content does, however stale this process's status version is
+    set_response_etag(response)
+    return get_conditional_response(request, etag=response['ETag'], response=response)
 
 
 def service_detail(request, service_id):
@@ -55,7 +81,10 @@ def service_detail(request, service_id):
 def service_history_json(request, service_id):
     """API endpoint to get service history as JSON"""
     service = get_object_or_404(Service, id=service_id, is_active=True)
-    updates = service.status_updates.all()[:10]
+    # service_id stays loaded so the related manager can attach the known service
+    updates = service.status_updates.select_related('created_by').only(
+        'service', 'status', 'comments', 'plan', 'created_at', 'created_by__username'
+    )[:10]
 
     data = {
         'service': service.name,
@@ -63,13 +92,15 @@ def service_history_json(request, service_id):
             {
                 'status': update.get_status_display(),
                 'status_code': update.status,
-                'problem': update.problem,
+                # Kept under its original key for existing consumers of this endpoint
+                'problem': update.comments,
                 'plan': update.plan,
-                'created_at': update.created_at.isoformat(),
+                'created_at': update.created_at,
                 'created_by': update.created_by.username if update.created_by else None,
             }
             for update in updates
         ]
     }
 
-    return JsonResponse(data)
\ No newline at end of file
+    # orjson serializes datetimes natively and is much faster than the stdlib encoder
+    return HttpResponse(orjson.dumps(data, option=orjson.OPT_NAIVE_UTC), content_type='application/json')
\ No newline at end of file